@@ -0,0 +1,84 @@
+# Max Markov 10.19.2026
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict
+
+
+IMPORT_TIME_MODULE = 'directory_profiler'
+IMPORT_TIME_RUNS = 10
+IMPORT_TIME_LINE_PREFIX = 'import time:'
+IMPORT_TIME_CUMULATIVE_INDEX = 1
+
+IMPORT_TIME_MESSAGE_TEMPLATE = 'Startup import of {}: best {:.2f}ms, mean {:.2f}ms over {} runs'
+
+HASH_THROUGHPUT_FILE_SIZE = 64 * 1024 * 1024
+HASH_THROUGHPUT_RUNS = 3
+BYTES_IN_MEGABYTE = 1024 * 1024
+HASH_THROUGHPUT_MESSAGE_TEMPLATE = 'Hashing with {:<10} {:>10.1f} MB/s'
+
+
+def measure_import_time(module: str = IMPORT_TIME_MODULE) -> int:
+    """Import module in a fresh interpreter with '-X importtime' & get its cumulative import time
+    :param module: Name of the module to be imported
+    :return: Cumulative import time in microseconds
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=directory,
+                            capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        if line.startswith(IMPORT_TIME_LINE_PREFIX):
+            columns = [column.strip() for column in line[len(IMPORT_TIME_LINE_PREFIX):].split('|')]
+            if columns[-1] == module:
+                return int(columns[IMPORT_TIME_CUMULATIVE_INDEX])
+    raise ValueError(module)
+
+
+def benchmark_import_time(runs: int = IMPORT_TIME_RUNS) -> Dict[str, float]:
+    """Repeat import time measurement to smooth out noise
+    :param runs: Amount of fresh interpreters to start
+    :return: Best & mean import time in milliseconds
+    """
+    timings = [measure_import_time() / 1000 for _ in range(runs)]
+    return {'best': min(timings), 'mean': sum(timings) / len(timings)}
+
+
+def benchmark_hash_throughput(file_size: int = HASH_THROUGHPUT_FILE_SIZE,
+                              runs: int = HASH_THROUGHPUT_RUNS) -> Dict[str, float]:
+    """Compare file hashing speed of every algorithm available in current environment
+    NOTE: File is hashed from page cache, so results show hashing cost rather than disk speed
+    :param file_size: Size of the generated file in bytes
+    :param runs: Amount of hash calculations per algorithm, best one is taken
+    :return: Best throughput in megabytes per second for every algorithm
+    """
+    from hash_algorithms import get_available_hash_algorithms
+    from utility import calculate_file_hash
+    throughput = {}
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, 'content.bin')
+        with open(file_path, 'wb') as file:
+            file.write(os.urandom(file_size))
+        for algorithm in get_available_hash_algorithms():
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                calculate_file_hash(file_path, algorithm)
+                timings.append(time.perf_counter() - start)
+            throughput[algorithm] = file_size / BYTES_IN_MEGABYTE / min(timings)
+    return throughput
+
+
+def main():
+    """Print benchmark results"""
+    import_timings = benchmark_import_time()
+    print(IMPORT_TIME_MESSAGE_TEMPLATE.format(IMPORT_TIME_MODULE, import_timings['best'], import_timings['mean'],
+                                              IMPORT_TIME_RUNS))
+    for algorithm, megabytes_per_second in benchmark_hash_throughput().items():
+        print(HASH_THROUGHPUT_MESSAGE_TEMPLATE.format(algorithm, megabytes_per_second))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,11 +2,16 @@
 
 from typing import List, Optional, Union
 import os
+import stat
 
 import messaging
-from utility import get_file_access_rights, calculate_file_sha256_hash
+import throttling
+from utility import get_file_access_rights, calculate_file_hash
+from hash_algorithms import DEFAULT_HASH_ALGORITHM
 from database_manager import DatabaseManager
+from hashing_scheduler import HashingScheduler
 from information_storage import Directory, File
+from path_interning import PathRegistry, DIRECTORY_DESCRIPTORS_SUPPORTED, scan_directory_with_descriptor
 
 
 FLOAT_COMPARISON_THRESHOLD = 0.0001
@@ -15,82 +20,132 @@ DIRECTORY_FOUND_MESSAGE_TEMPLATE = 'Found directory at: {}'
 FILE_FOUND_MESSAGE_TEMPLATE = 'Found file at: {}'
 
 
-def recursive_directory_walker(root_directory: str):
+def recursive_directory_walker(root_directory: str, use_directory_descriptors: bool = False):
     """Performs bypass through directory content & generating file/directory locations
     NOTE: Based on 'Breadth first search' algorithm - see https://en.wikipedia.org/wiki/Breadth-first_search
+    NOTE: Pending elements are stored as (parent directory, name) pairs, full path is built only on processing
     :param root_directory: Path to the starting directory for an algorithm
+    :param use_directory_descriptors: Get element statistics relative to parent directory descriptor,
+    yielded statistics are None otherwise
     """
-    recursion_stack = [(root_directory, None)]
+    use_directory_descriptors = use_directory_descriptors and DIRECTORY_DESCRIPTORS_SUPPORTED
+    path_registry = PathRegistry()
+    recursion_stack = [(None, root_directory, None)]
     while recursion_stack:
-        current_path, parent_directory = recursion_stack.pop(0)
-        current_data = yield current_path, parent_directory
+        parent_directory, name, statistics = recursion_stack.pop(0)
+        current_path = path_registry.build_path(parent_directory, name)
+        current_data = yield current_path, parent_directory, statistics
         if isinstance(current_data, Directory):
+            path_registry.add_directory(current_data, current_path)
             try:
-                for component in os.listdir(current_path):
-                    component = os.path.join(current_path, component)
-                    recursion_stack.append((component, current_data))
+                if use_directory_descriptors:
+                    for component, component_statistics in scan_directory_with_descriptor(current_path):
+                        recursion_stack.append((current_data, component, component_statistics))
+                else:
+                    for component in os.listdir(current_path):
+                        recursion_stack.append((current_data, component, None))
             except PermissionError:
                 pass
 
 
-def handle_directory_file_system(path: str, database_access: DatabaseManager) -> List[Union[Directory, File]]:
+def handle_directory_file_system(path: str, database_access: DatabaseManager, hashing_window: int = 0,
+                                 hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+                                 use_directory_descriptors: bool = False) -> List[Union[Directory, File]]:
     """For each element in directory checks if it is a directory or a file & calls sufficient data collector
     :param path: Path to the processed file system element
     :param database_access: Database communication, providing previous run information
+    :param hashing_window: Amount of files buffered for on-disk ordered hashing, 0 disables buffering
+    :param hash_algorithm: Name of the algorithm used for file content hashing
+    :param use_directory_descriptors: Get element statistics relative to parent directory descriptor
     :return: Gathered information about directory elements
     """
     path = os.path.abspath(path)  # IMPORTANT: this also makes path windows-styled
+    scheduler = HashingScheduler(hashing_window) if hashing_window > 0 else None
     collected_elements = []
     data = None
-    element_generator = recursive_directory_walker(path)
+    element_generator = recursive_directory_walker(path, use_directory_descriptors)
     while True:
         try:
-            path, parent = element_generator.send(data)
+            path, parent, statistics = element_generator.send(data)
         except StopIteration:
             break
-        data = apply_data_collector(path, parent, database_access)
+        data = apply_data_collector(path, parent, database_access, scheduler, hash_algorithm, statistics)
         collected_elements.append(data)
+    if scheduler is not None:
+        scheduler.flush()
     return collected_elements
 
 
-def apply_data_collector(path: str, parent: Directory, database_access: DatabaseManager) -> Union[Directory, File]:
+def apply_data_collector(path: str, parent: Directory, database_access: DatabaseManager,
+                         scheduler: Optional[HashingScheduler] = None,
+                         hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+                         statistics: Optional[os.stat_result] = None) -> Union[Directory, File]:
     """Based on element path decide which collector to call
-    NOTE: This function also writes messages
+    NOTE: This function also writes messages & is throttled by throttling.limiter stat budget
+    unless statistics were already gathered (and throttled) by the walker
     :param path: Path to current element
     :param parent: Parent directory for current element
     :param database_access: Database communication, providing previous run information
+    :param scheduler: Scheduler postponing hash calculation optional
+    :param hash_algorithm: Name of the algorithm used for file content hashing
+    :param statistics: Already gathered element statistics optional
     :return: Collected element data
     """
-    if os.path.isdir(path):
+    if statistics is None:
+        throttling.limiter.consume_stat()
+        try:
+            statistics = os.stat(path)
+        except (OSError, ValueError):
+            return None
+    if stat.S_ISDIR(statistics.st_mode):
         messaging.messanger.send_message(DIRECTORY_FOUND_MESSAGE_TEMPLATE.format(path))
-        return collect_directory_data(path, parent)
-    if os.path.isfile(path):
+        return collect_directory_data(path, parent, statistics)
+    if stat.S_ISREG(statistics.st_mode):
         messaging.messanger.send_message(FILE_FOUND_MESSAGE_TEMPLATE.format(path))
-        return collect_file_data(path, parent, database_access)
+        return collect_file_data(path, parent, database_access, scheduler, hash_algorithm, statistics)
 
 
-def collect_directory_data(directory_path: str, parent: Optional[Directory]) -> Directory:
+def collect_directory_data(directory_path: str, parent: Optional[Directory],
+                           statistics: Optional[os.stat_result] = None) -> Directory:
     """Gathers data about specified directory & creates Directory from it
     :param directory_path: Path to the file system element proven to be a directory
     :param parent: Parent Directory optional
+    :param statistics: Already gathered directory statistics optional
     :return: Directory object based on gathered data
     """
-    return Directory(os.stat(directory_path).st_ino, os.path.basename(directory_path), parent)
+    if statistics is None:
+        statistics = os.stat(directory_path)
+    return Directory(statistics.st_ino, os.path.basename(directory_path), parent)
 
 
-def collect_file_data(file_path: str, directory: Directory, database_access: DatabaseManager) -> File:
+def collect_file_data(file_path: str, directory: Directory, database_access: DatabaseManager,
+                      scheduler: Optional[HashingScheduler] = None,
+                      hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
+                      statistics: Optional[os.stat_result] = None) -> File:
     """Gathers data about specified file & creates File from it
+    NOTE: Stored hash is reused only if file is unchanged & it was calculated with the same algorithm;
+    if scheduler is given, content hash is filled later on scheduler flush
     :param file_path: Path to the file system element proven to be a file
     :param directory: Directory which this file is stored in
     :param database_access: Database communication, providing previous run information
+    :param scheduler: Scheduler postponing hash calculation optional
+    :param hash_algorithm: Name of the algorithm used for file content hashing
+    :param statistics: Already gathered file statistics optional
     :return: File object based on gathered data
     """
-    file_statistics = os.stat(file_path)
+    file_statistics = statistics if statistics is not None else os.stat(file_path)
     previous = database_access.get_file_information_from_database(file_statistics.st_ino)
     if previous is not None:
-        last_modified, content_hash = previous
-        if abs(last_modified - file_statistics.st_mtime) < FLOAT_COMPARISON_THRESHOLD:
+        last_modified, content_hash, previous_hash_algorithm = previous
+        if previous_hash_algorithm == hash_algorithm and \
+                abs(last_modified - file_statistics.st_mtime) < FLOAT_COMPARISON_THRESHOLD:
             return File(file_statistics.st_ino, os.path.basename(file_path), file_statistics.st_mtime,
-                        get_file_access_rights(file_statistics.st_mode), content_hash, directory)
+                        get_file_access_rights(file_statistics.st_mode), content_hash, directory, hash_algorithm)
+    if scheduler is not None:
+        file = File(file_statistics.st_ino, os.path.basename(file_path), file_statistics.st_mtime,
+                    get_file_access_rights(file_statistics.st_mode), None, directory, hash_algorithm)
+        scheduler.schedule(file_path, file)
+        return file
     return File(file_statistics.st_ino, os.path.basename(file_path), file_statistics.st_mtime,
-                get_file_access_rights(file_statistics.st_mode), calculate_file_sha256_hash(file_path), directory)
+                get_file_access_rights(file_statistics.st_mode), calculate_file_hash(file_path, hash_algorithm),
+                directory, hash_algorithm)
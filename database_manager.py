@@ -1,9 +1,11 @@
 # Max Markov 01.26.2023
 
+import os
 import sqlite3
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
 from information_storage import Directory, File
+from hash_algorithms import DEFAULT_HASH_ALGORITHM
 
 
 DIRECTORIES_TABLE_CREATION = '''
@@ -15,28 +17,46 @@ CREATE TABLE IF NOT EXISTS directories (
 );
 '''
 DIRECTORY_INSERT_COMMAND = 'INSERT OR REPLACE INTO directories(id, parent_id, name) VALUES(?, ?, ?)'
+DIRECTORY_PATHS_COMMAND = '''
+WITH RECURSIVE directory_paths(id, path) AS (
+    SELECT id, COALESCE(?, name) FROM directories WHERE (? IS NULL AND parent_id IS NULL) OR id = ?
+    UNION ALL
+    SELECT directories.id, directory_paths.path || ? || directories.name
+    FROM directories JOIN directory_paths ON directories.parent_id = directory_paths.id
+)
+SELECT id, path FROM directory_paths
+'''
 
-FILES_TABLE_CREATION = '''
+FILES_TABLE_CREATION = f'''
 CREATE TABLE IF NOT EXISTS files (
     id integer PRIMARY KEY,
     directory integer NOT NULL,
     name text NOT NULL,
     last_modification timestamp NOT NULL,
     access_rights text NOT NULL,
-    content_hash BLOB(32) NOT NULL,
+    content_hash BLOB NOT NULL,
+    hash_algorithm text NOT NULL DEFAULT '{DEFAULT_HASH_ALGORITHM}',
     FOREIGN KEY (directory) REFERENCES directories(id)
 );
 '''
+FILES_TABLE_COLUMNS_COMMAND = 'PRAGMA table_info(files)'
+FILES_TABLE_COLUMN_NAME_INDEX = 1
+HASH_ALGORITHM_COLUMN = 'hash_algorithm'
+# NOTE: Databases created before hash algorithm selection hold SHA256 hashes only
+HASH_ALGORITHM_COLUMN_ADDITION = f'''
+ALTER TABLE files ADD COLUMN {HASH_ALGORITHM_COLUMN} text NOT NULL DEFAULT '{DEFAULT_HASH_ALGORITHM}'
+'''
 FILE_GET_COMMAND = '''
 SELECT * FROM files WHERE id = ?
 '''
 FILE_INSERT_COMMAND = '''
 INSERT OR REPLACE 
-INTO files(id, directory, name, last_modification, access_rights, content_hash) 
-VALUES(?, ?, ?, ?, ?, ?)
+INTO files(id, directory, name, last_modification, access_rights, content_hash, hash_algorithm) 
+VALUES(?, ?, ?, ?, ?, ?, ?)
 '''
 FILE_RECORD_LAST_MODIFICATION_INDEX = 3
 FILE_RECORD_CONTENT_HASH_INDEX = 5
+FILE_RECORD_HASH_ALGORITHM_INDEX = 6
 
 
 class DatabaseManager:
@@ -45,31 +65,68 @@ class DatabaseManager:
     def __init__(self, path: str):
         self.connection = sqlite3.connect(path)
         self.cursor = self.connection.cursor()
+        self.schema_ready = False
+
+    def bootstrap_schema(self):
+        """Create tables needed for writing & add columns missing in databases from older versions
+        NOTE: Tables are created only once per DatabaseManager
+        """
+        if self.schema_ready:
+            return
+        self.cursor.execute(DIRECTORIES_TABLE_CREATION)
+        self.cursor.execute(FILES_TABLE_CREATION)
+        columns = [column[FILES_TABLE_COLUMN_NAME_INDEX] for column in
+                   self.cursor.execute(FILES_TABLE_COLUMNS_COMMAND).fetchall()]
+        if HASH_ALGORITHM_COLUMN not in columns:
+            self.cursor.execute(HASH_ALGORITHM_COLUMN_ADDITION)
+        self.schema_ready = True
 
     def insert_information_into_database(self, data: List[Union[Directory, File]]):
         """Write file system elements data into database
         NOTE: Also creates tables needed for writing & commits afterwards
         :param data: List of Directory/File objects to be written
         """
-        self.cursor.execute(DIRECTORIES_TABLE_CREATION)
-        self.cursor.execute(FILES_TABLE_CREATION)
+        self.bootstrap_schema()
         for element in data:
             self.insert_element_into_database(element)
         self.connection.commit()
 
     def get_file_information_from_database(self, element_id: int) -> Optional[tuple]:
         """Get element information from database
+        NOTE: Also creates tables if they are missing
         :param element_id: ID of the desired element
-        :return: Last modification date & content hash
+        :return: Last modification date, content hash & name of the algorithm it was calculated with
         """
         try:
+            self.bootstrap_schema()
             record = self.cursor.execute(FILE_GET_COMMAND, (element_id, )).fetchone()
             if record is not None:
-                return record[FILE_RECORD_LAST_MODIFICATION_INDEX], record[FILE_RECORD_CONTENT_HASH_INDEX]
+                return record[FILE_RECORD_LAST_MODIFICATION_INDEX], record[FILE_RECORD_CONTENT_HASH_INDEX], \
+                    record[FILE_RECORD_HASH_ALGORITHM_INDEX]
             return None
         except sqlite3.OperationalError:
             return None
 
+    def get_directory_paths(self, root_path: Optional[str] = None) -> Dict[int, str]:
+        """Reconstruct paths of stored directories with a single query
+        NOTE: Library helper for database consumers, profiling itself does not need it;
+        without root_path, paths start from the profiled root directory name & can not be used for I/O
+        :param root_path: Path of the profiled root directory, limits result to its tree & makes paths start from it
+        :return: Path of every directory by its ID, empty if root_path does not exist
+        """
+        root_id = None
+        if root_path is not None:
+            root_path = os.path.abspath(root_path)
+            try:
+                root_id = os.stat(root_path).st_ino  # NOTE: directories are stored by inode, see collect_directory_data
+            except OSError:
+                return {}
+        try:
+            return dict(self.cursor.execute(DIRECTORY_PATHS_COMMAND,
+                                            (root_path, root_id, root_id, os.sep)).fetchall())
+        except sqlite3.OperationalError:
+            return {}
+
     def insert_element_into_database(self, element: Union[Directory, List]):
         """Write single file system element into database
         :param element: Directory/File object to be written
@@ -84,4 +141,4 @@ class DatabaseManager:
             if element.content_hash is not None:  # TODO this check is needed because of PermissionError occurrence
                 self.cursor.execute(FILE_INSERT_COMMAND,
                                     (element.id, element.directory.id, element.name, element.last_modified,
-                                     element.access_rights, element.content_hash))
+                                     element.access_rights, element.content_hash, element.hash_algorithm))
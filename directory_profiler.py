@@ -1,9 +1,8 @@
 # Max Markov 01.24.2023
 
 import messaging
+import throttling
 from input_validator import ConsoleArgumentParser, validate_input
-from data_collector import handle_directory_file_system
-from database_manager import DatabaseManager
 
 
 PROGRAM_NAME = 'Directory Profiler'
@@ -12,14 +11,23 @@ SCRIPT_FINAL_MESSAGE = f'{PROGRAM_NAME} has finished operating'
 
 
 def main():
-    """Doin' Stuff..."""
+    """Doin' Stuff...
+    NOTE: Heavy modules are imported only after input validation to keep startup fast
+    """
     arguments, not_parsed = ConsoleArgumentParser().parse_known_args()
     messaging.messanger = messaging.MessageWriter(arguments.log, arguments.verbose)
     messaging.messanger.send_message(SCRIPT_START_MESSAGE)
     validate_input(arguments, not_parsed)
+    throttling.limiter = throttling.ResourceLimiter(arguments.max_read_rate, arguments.max_stat_rate)
+    for message in throttling.lower_process_priority(arguments.niceness, arguments.idle_io):
+        messaging.messanger.send_message(message)
+    from data_collector import handle_directory_file_system
+    from database_manager import DatabaseManager
     database_access = DatabaseManager(arguments.database)
-    data = handle_directory_file_system(arguments.directory, database_access)
+    data = handle_directory_file_system(arguments.directory, database_access, arguments.hashing_window,
+                                        arguments.hash_algorithm, arguments.directory_descriptors)
     database_access.insert_information_into_database(data)
+    messaging.messanger.send_message(throttling.limiter.get_summary())
     messaging.messanger.send_message(SCRIPT_FINAL_MESSAGE)
 
 
@@ -0,0 +1,73 @@
+# Max Markov 10.19.2026
+
+from functools import partial
+from typing import Callable, Dict, List
+
+
+DEFAULT_HASH_ALGORITHM = 'sha256'
+
+
+class HashAlgorithmUnavailableError(Exception):
+    """Raised if hash algorithm is unknown or its optional package is not installed"""
+    MESSAGE = "Hash algorithm {} is not available."
+
+    def __init__(self, name: str):
+        super().__init__(HashAlgorithmUnavailableError.MESSAGE.format(name))
+
+
+def load_hashlib_algorithm(name: str) -> Callable:
+    """Get hash object constructor from standard library
+    :param name: Name of the hashlib constructor
+    :return: Hash object constructor
+    """
+    import hashlib
+    return getattr(hashlib, name)
+
+
+def load_xxhash_algorithm() -> Callable:
+    """Get XXH3 128-bit hash object constructor from optional xxhash package"""
+    import xxhash
+    return xxhash.xxh3_128
+
+
+def load_blake3_algorithm() -> Callable:
+    """Get BLAKE3 hash object constructor from optional blake3 package"""
+    from blake3 import blake3
+    return blake3
+
+
+# NOTE: Modules are imported only when algorithm is requested - both for startup speed & optional packages
+HASH_ALGORITHM_LOADERS: Dict[str, Callable[[], Callable]] = {
+    'sha256': partial(load_hashlib_algorithm, 'sha256'),
+    'sha1': partial(load_hashlib_algorithm, 'sha1'),
+    'blake2b': partial(load_hashlib_algorithm, 'blake2b'),
+    'blake2s': partial(load_hashlib_algorithm, 'blake2s'),
+    'xxh3_128': load_xxhash_algorithm,
+    'blake3': load_blake3_algorithm,
+}
+
+
+def get_hash_constructor(name: str) -> Callable:
+    """Find hash object constructor by algorithm name
+    :param name: Name of the algorithm from HASH_ALGORITHM_LOADERS
+    :return: Constructor of object with update & digest methods
+    :raise: HashAlgorithmUnavailableError
+    """
+    try:
+        return HASH_ALGORITHM_LOADERS[name]()
+    except (KeyError, ImportError):
+        raise HashAlgorithmUnavailableError(name)
+
+
+def get_available_hash_algorithms() -> List[str]:
+    """Compiles list of algorithms which can be used in current environment
+    :return: Names of available algorithms
+    """
+    available = []
+    for name in HASH_ALGORITHM_LOADERS:
+        try:
+            get_hash_constructor(name)
+        except HashAlgorithmUnavailableError:
+            continue
+        available.append(name)
+    return available
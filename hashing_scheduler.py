@@ -0,0 +1,45 @@
+# Max Markov 10.19.2026
+
+from typing import List, Tuple
+
+import messaging
+from utility import calculate_file_hash, prefetch_file
+from information_storage import File
+
+
+BATCH_HASHING_MESSAGE_TEMPLATE = 'Hashing batch of {} files in on-disk order'
+
+
+class HashingScheduler:
+    """Buffers files pending hash calculation & processes them in on-disk order
+    NOTE: Files are sorted by inode number, which on most file systems correlates with physical placement,
+    so reading them in this order reduces disk seeking compared to discovery order
+    """
+
+    def __init__(self, window_size: int):
+        self.window_size = window_size
+        self.pending: List[Tuple[str, File]] = []
+
+    def schedule(self, file_path: str, file: File):
+        """Postpone hash calculation for the file & process buffered files if window is full
+        :param file_path: Path to the file which needs hash calculation
+        :param file: File object which content hash is filled afterwards using its hash algorithm
+        """
+        self.pending.append((file_path, file))
+        if len(self.pending) >= self.window_size:
+            self.flush()
+
+    def flush(self):
+        """Calculate hashes for all buffered files
+        NOTE: Beginning of the next file in order is prefetched while current one is being read
+        """
+        if not self.pending:
+            return
+        batch = sorted(self.pending, key=lambda pending_file: pending_file[1].id)
+        self.pending = []
+        messaging.messanger.send_message(BATCH_HASHING_MESSAGE_TEMPLATE.format(len(batch)))
+        prefetch_file(batch[0][0])
+        for position, (file_path, file) in enumerate(batch):
+            if position + 1 < len(batch):
+                prefetch_file(batch[position + 1][0])
+            file.content_hash = calculate_file_hash(file_path, file.hash_algorithm, io_hints=True)
@@ -4,6 +4,8 @@ from __future__ import annotations
 from typing import Optional
 from dataclasses import dataclass
 
+from hash_algorithms import DEFAULT_HASH_ALGORITHM
+
 
 @dataclass
 class Directory:
@@ -22,3 +24,4 @@ class File:
     access_rights: str
     content_hash: bytes
     directory: Directory
+    hash_algorithm: str = DEFAULT_HASH_ALGORITHM
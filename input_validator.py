@@ -2,10 +2,11 @@
 
 import os
 from argparse import Namespace, ArgumentParser
-from typing import List
+from typing import List, Optional
 
 import messaging
 from utility import check_if_file_accessible, create_file_if_possible
+from hash_algorithms import DEFAULT_HASH_ALGORITHM, HASH_ALGORITHM_LOADERS, get_hash_constructor
 
 
 SCRIPT_NAME = 'directory_profiler.py'
@@ -31,6 +32,14 @@ class NotAFileError(Exception):
         super().__init__(NotAFileError.MESSAGE.format(location))
 
 
+class NonPositiveBudgetError(Exception):
+    """Raised if resource budget is zero or negative"""
+    MESSAGE = "Budget {} must be a positive number, got {}."
+
+    def __init__(self, option: str, value: int):
+        super().__init__(NonPositiveBudgetError.MESSAGE.format(option, value))
+
+
 class ConsoleArgumentParser(ArgumentParser):
     """Console arguments handler based on argparse.ArgumentParser"""
 
@@ -43,6 +52,26 @@ class ConsoleArgumentParser(ArgumentParser):
     VERBOSE_KEYWORD = {'action': 'store_true', 'help': 'let process messages to appear in console'}
     LOGGING_POSITIONAL = ('-l', '--log')
     LOGGING_KEYWORD = {'required': True, 'help': 'path to the logging file for writing', 'metavar': 'LOGGING_FILEPATH'}
+    HASHING_WINDOW_POSITIONAL = ('-w', '--hashing-window')
+    HASHING_WINDOW_KEYWORD = {'type': int, 'default': 0, 'metavar': 'FILES_AMOUNT',
+                              'help': 'amount of files buffered & hashed in on-disk order, 0 disables buffering'}
+    READ_RATE_POSITIONAL = ('--max-read-rate', )
+    READ_RATE_KEYWORD = {'type': int, 'default': None, 'metavar': 'BYTES_PER_SECOND',
+                         'help': 'limit for file content reading speed, unlimited if omitted'}
+    STAT_RATE_POSITIONAL = ('--max-stat-rate', )
+    STAT_RATE_KEYWORD = {'type': int, 'default': None, 'metavar': 'FILES_PER_SECOND',
+                         'help': 'limit for amount of file system elements inspected per second, unlimited if omitted'}
+    NICENESS_POSITIONAL = ('--niceness', )
+    NICENESS_KEYWORD = {'type': int, 'default': 0, 'metavar': 'INCREMENT',
+                        'help': 'increment for process niceness, lowering its CPU priority'}
+    IDLE_IO_POSITIONAL = ('--idle-io', )
+    IDLE_IO_KEYWORD = {'action': 'store_true', 'help': 'use idle I/O scheduling class (requires psutil)'}
+    HASH_ALGORITHM_POSITIONAL = ('-a', '--hash-algorithm')
+    HASH_ALGORITHM_KEYWORD = {'default': DEFAULT_HASH_ALGORITHM, 'choices': list(HASH_ALGORITHM_LOADERS),
+                              'help': 'algorithm for file content hashing, xxh3_128 & blake3 need optional packages'}
+    DIRECTORY_DESCRIPTORS_POSITIONAL = ('--directory-descriptors', )
+    DIRECTORY_DESCRIPTORS_KEYWORD = {'action': 'store_true',
+                                     'help': 'inspect elements relative to opened parent directory (POSIX only)'}
 
     def __init__(self):
         super().__init__(prog=SCRIPT_NAME, description=PROGRAM_DESCRIPTION)
@@ -50,6 +79,16 @@ class ConsoleArgumentParser(ArgumentParser):
         self.add_argument(*ConsoleArgumentParser.DATABASE_POSITIONAL, **ConsoleArgumentParser.DATABASE_KEYWORD)
         self.add_argument(*ConsoleArgumentParser.VERBOSE_POSITIONAL, **ConsoleArgumentParser.VERBOSE_KEYWORD)
         self.add_argument(*ConsoleArgumentParser.LOGGING_POSITIONAL, **ConsoleArgumentParser.LOGGING_KEYWORD)
+        self.add_argument(*ConsoleArgumentParser.HASHING_WINDOW_POSITIONAL,
+                          **ConsoleArgumentParser.HASHING_WINDOW_KEYWORD)
+        self.add_argument(*ConsoleArgumentParser.READ_RATE_POSITIONAL, **ConsoleArgumentParser.READ_RATE_KEYWORD)
+        self.add_argument(*ConsoleArgumentParser.STAT_RATE_POSITIONAL, **ConsoleArgumentParser.STAT_RATE_KEYWORD)
+        self.add_argument(*ConsoleArgumentParser.NICENESS_POSITIONAL, **ConsoleArgumentParser.NICENESS_KEYWORD)
+        self.add_argument(*ConsoleArgumentParser.IDLE_IO_POSITIONAL, **ConsoleArgumentParser.IDLE_IO_KEYWORD)
+        self.add_argument(*ConsoleArgumentParser.HASH_ALGORITHM_POSITIONAL,
+                          **ConsoleArgumentParser.HASH_ALGORITHM_KEYWORD)
+        self.add_argument(*ConsoleArgumentParser.DIRECTORY_DESCRIPTORS_POSITIONAL,
+                          **ConsoleArgumentParser.DIRECTORY_DESCRIPTORS_KEYWORD)
 
 
 def validate_input(arguments: Namespace, not_parsed: List[str]):
@@ -57,7 +96,7 @@ def validate_input(arguments: Namespace, not_parsed: List[str]):
     NOTE: This function writes messages
     :param arguments: Arguments parsed from console input
     :param not_parsed: Part which is missing correlation
-    :raise: DirectoryMissingError
+    :raise: DirectoryMissingError, NonPositiveBudgetError, HashAlgorithmUnavailableError
     """
     messaging.messanger.send_message(ARGUMENTS_MESSAGE_TEMPLATE.format(vars(arguments)))
     if not_parsed:
@@ -66,6 +105,19 @@ def validate_input(arguments: Namespace, not_parsed: List[str]):
         raise DirectoryMissingError(arguments.directory)
     validate_file_for_writing(arguments.database)
     validate_file_for_writing(arguments.log)
+    validate_budget(ConsoleArgumentParser.READ_RATE_POSITIONAL[0], arguments.max_read_rate)
+    validate_budget(ConsoleArgumentParser.STAT_RATE_POSITIONAL[0], arguments.max_stat_rate)
+    get_hash_constructor(arguments.hash_algorithm)
+
+
+def validate_budget(option: str, value: Optional[int]):
+    """Check if resource budget is either omitted or positive
+    :param option: Console option the budget was given with
+    :param value: Budget value, None means unlimited
+    :raise: NonPositiveBudgetError
+    """
+    if value is not None and value <= 0:
+        raise NonPositiveBudgetError(option, value)
 
 
 def validate_file_for_writing(path: str):
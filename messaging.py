@@ -1,34 +1,44 @@
 # Max Markov 01.26.2023
 
-import logging
-
-
 BASE_LOG = 'base_log.txt'
 DEFAULT_VERBOSE = False
 
 
 class MessageWriter:
-    """Logger with capability of console message display"""
+    """Logger with capability of console message display
+    NOTE: Logging is configured on the first message, so creating writer does not touch logging file
+    """
     # TODO combine two sending methods
 
     FORMAT = "[%(asctime)s] %(levelname)s %(message)s"
-    LEVEL = logging.INFO
+    LEVEL = 'INFO'
     ENCODING = 'utf-8'
 
     def __init__(self, logging_file: str, verbose: bool):
+        self.logging_file = logging_file
         self.verbose = verbose
-        logging.basicConfig(filename=logging_file, format=MessageWriter.FORMAT, level=MessageWriter.LEVEL,
-                            force=True, encoding=MessageWriter.ENCODING)
+        self.logger = None
+
+    def get_logger(self):
+        """Configure logging if it was not done yet
+        :return: Root logger writing into logging file
+        """
+        if self.logger is None:
+            import logging
+            logging.basicConfig(filename=self.logging_file, format=MessageWriter.FORMAT, level=MessageWriter.LEVEL,
+                                force=True, encoding=MessageWriter.ENCODING)
+            self.logger = logging.getLogger()
+        return self.logger
 
     def send_message(self, message: str):
         """Log message & display it if verbose is enabled"""
-        logging.info(message)
+        self.get_logger().info(message)
         if self.verbose:
             print(message)
 
     def send_error(self, message: str):
         """Log error message & display appropriate explanation"""
-        logging.error(message)
+        self.get_logger().error(message)
         if self.verbose:
             print(message)
 
@@ -0,0 +1,70 @@
+# Max Markov 10.19.2026
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+import throttling
+from information_storage import Directory
+
+
+# NOTE: Descriptor-relative calls are missing on some platforms (e.g. Windows)
+DIRECTORY_DESCRIPTORS_SUPPORTED = os.stat in os.supports_dir_fd and os.scandir in os.supports_fd
+DIRECTORY_OPEN_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0)
+
+
+class PathRegistry:
+    """Stores full path of every visited directory once
+    NOTE: Other elements are referenced as (parent directory, name) pairs & their paths are built on demand
+    """
+
+    def __init__(self):
+        self.directory_paths: Dict[int, Tuple[Directory, str]] = {}
+
+    def add_directory(self, directory: Directory, path: str):
+        """Remember full path of the directory
+        NOTE: Directory object is kept alongside its path, so its id() stays unique while registry exists
+        :param directory: Visited Directory object
+        :param path: Full path to the directory
+        """
+        self.directory_paths[id(directory)] = (directory, path)
+
+    def get_directory_path(self, directory: Directory) -> str:
+        """Get stored full path of the directory
+        :param directory: Directory object added to registry before
+        :return: Full path to the directory
+        """
+        return self.directory_paths[id(directory)][1]
+
+    def build_path(self, parent: Optional[Directory], name: str) -> str:
+        """Compose full path of the element
+        :param parent: Directory containing the element, None for the root element
+        :param name: Element name, full path for the root element
+        :return: Full path to the element
+        """
+        if parent is None:
+            return name
+        return os.path.join(self.get_directory_path(parent), name)
+
+
+def scan_directory_with_descriptor(path: str) -> List[Tuple[str, Optional[os.stat_result]]]:
+    """List directory content & get statistics of every element relative to directory descriptor
+    NOTE: Only directory itself is resolved by full path, elements are looked up by name inside it;
+    every stat call is throttled by throttling.limiter stat budget
+    :param path: Full path to the directory
+    :return: Element names with their statistics, None if statistics can not be obtained
+    :raise: PermissionError
+    """
+    descriptor = os.open(path, DIRECTORY_OPEN_FLAGS)
+    try:
+        with os.scandir(descriptor) as entries:
+            names = [entry.name for entry in entries]
+        content = []
+        for name in names:
+            throttling.limiter.consume_stat()
+            try:
+                content.append((name, os.stat(name, dir_fd=descriptor)))
+            except OSError:
+                content.append((name, None))
+        return content
+    finally:
+        os.close(descriptor)
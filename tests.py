@@ -3,9 +3,13 @@
 import unittest
 from unittest.mock import patch
 import os.path
+import hashlib
 import shutil
 import stat
 import sqlite3
+import subprocess
+import sys
+import tempfile
 from random import choices
 from string import ascii_lowercase
 
@@ -15,6 +19,12 @@ import data_collector
 from data_collector import handle_directory_file_system, collect_directory_data, collect_file_data
 from input_validator import *
 from database_manager import DatabaseManager
+from hashing_scheduler import HashingScheduler
+import throttling
+from throttling import TokenBucket, ResourceLimiter
+from benchmarks import measure_import_time
+from hash_algorithms import DEFAULT_HASH_ALGORITHM, HashAlgorithmUnavailableError, get_available_hash_algorithms
+from path_interning import PathRegistry, scan_directory_with_descriptor
 
 
 TEST_ROOT = 'test_data'
@@ -80,11 +90,26 @@ class ArgumentValidationTestCase(unittest.TestCase):
         arguments, not_parsed = ConsoleArgumentParser().parse_known_args(args=self.script_arguments)
         self.assertRaises(FileCanNotBeCreatedError, validate_input, arguments, not_parsed)
 
+    def test_non_positive_read_rate(self):
+        """Check if correct error is raised on negative reading budget"""
+        self.script_arguments += ['--max-read-rate', '-5']
+        arguments, not_parsed = ConsoleArgumentParser().parse_known_args(args=self.script_arguments)
+        self.assertRaises(NonPositiveBudgetError, validate_input, arguments, not_parsed)
+
+    def test_zero_stat_rate(self):
+        """Check if correct error is raised on zero stat budget instead of treating it as unlimited"""
+        self.script_arguments += ['--max-stat-rate', '0']
+        arguments, not_parsed = ConsoleArgumentParser().parse_known_args(args=self.script_arguments)
+        self.assertRaises(NonPositiveBudgetError, validate_input, arguments, not_parsed)
+
     def test_normal_arguments(self):
         """Check if arguments are parsed correctly in some average scenario"""
         arguments, not_parsed = ConsoleArgumentParser().parse_known_args(args=self.script_arguments)
         manual_arguments = {'directory': DEFAULT_STRUCTURE_ARGUMENT, 'database': DEFAULT_DATABASE_ARGUMENT,
-                            'verbose': False, 'log': DEFAULT_LOG_FILE_ARGUMENT}
+                            'verbose': False, 'log': DEFAULT_LOG_FILE_ARGUMENT, 'hashing_window': 0,
+                            'max_read_rate': None, 'max_stat_rate': None, 'niceness': 0,
+                            'idle_io': False, 'hash_algorithm': DEFAULT_HASH_ALGORITHM,
+                            'directory_descriptors': False}
         self.assertEqual(vars(arguments), manual_arguments)
         self.assertFalse(not_parsed)
 
@@ -148,6 +173,34 @@ class DataCollectorTestCase(unittest.TestCase):
         self.assertTrue(all(element.directory is not None for element in data if isinstance(element, File)))
         self.assertTrue(all(isinstance(element, Directory) or isinstance(element, File) for element in data))
 
+    def test_handle_file_system_with_directory_descriptors(self):
+        """Check if descriptor-based traversal collects the same data as path-based one"""
+        os.makedirs(f'{DEFAULT_STRUCTURE_ARGUMENT}/first/second')
+        os.makedirs(f'{DEFAULT_STRUCTURE_ARGUMENT}/third')
+        DataCollectorTestCase.create_missing_file(f'{DEFAULT_STRUCTURE_ARGUMENT}/first/second/file0.txt')
+        DataCollectorTestCase.create_missing_file(f'{DEFAULT_STRUCTURE_ARGUMENT}/third/file1.txt')
+        data = handle_directory_file_system(DEFAULT_STRUCTURE_ARGUMENT, self.database_access)
+        descriptor_data = handle_directory_file_system(DEFAULT_STRUCTURE_ARGUMENT, self.database_access,
+                                                       use_directory_descriptors=True)
+        self.assertEqual(data, descriptor_data)
+
+    def test_path_registry(self):
+        """Check if full paths are composed from stored directory path & element name"""
+        registry = PathRegistry()
+        root = Directory(1, 'structure', None)
+        registry.add_directory(root, DEFAULT_STRUCTURE_ARGUMENT)
+        self.assertEqual(registry.build_path(None, DEFAULT_STRUCTURE_ARGUMENT), DEFAULT_STRUCTURE_ARGUMENT)
+        self.assertEqual(registry.build_path(root, 'file.txt'), os.path.join(DEFAULT_STRUCTURE_ARGUMENT, 'file.txt'))
+
+    def test_scan_directory_with_descriptor(self):
+        """Check if directory content statistics match path-based ones"""
+        os.makedirs(f'{DEFAULT_STRUCTURE_ARGUMENT}/first')
+        DataCollectorTestCase.create_missing_file(f'{DEFAULT_STRUCTURE_ARGUMENT}/file0.txt')
+        content = dict(scan_directory_with_descriptor(DEFAULT_STRUCTURE_ARGUMENT))
+        self.assertEqual(set(content), {'first', 'file0.txt'})
+        for name, statistics in content.items():
+            self.assertEqual(statistics.st_ino, os.stat(os.path.join(DEFAULT_STRUCTURE_ARGUMENT, name)).st_ino)
+
     def test_handle_file_system_third(self):
         """Check if correct data collected from third directory configuration"""
         os.makedirs(f'{DEFAULT_STRUCTURE_ARGUMENT}/first')
@@ -187,7 +240,7 @@ class HashOptimizationTestCase(unittest.TestCase):
             shutil.rmtree(TEST_ROOT, onerror=DataCollectorTestCase.on_deletion_error)
         os.makedirs(DEFAULT_STRUCTURE_ARGUMENT)
         self.database_access = DatabaseManager(DEFAULT_DATABASE_ARGUMENT)
-        self.patcher = patch('data_collector.calculate_file_sha256_hash', return_value='fake hash')
+        self.patcher = patch('data_collector.calculate_file_hash', return_value='fake hash')
         self.patch_object = self.patcher.start()
 
     def tearDown(self):
@@ -231,6 +284,117 @@ class HashOptimizationTestCase(unittest.TestCase):
         self.assertEqual(self.patch_object.call_count, 2)
 
 
+class HashingSchedulerTestCase(unittest.TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        """Remove all file structures generated while testing"""
+        if os.path.isdir(TEST_ROOT):
+            shutil.rmtree(TEST_ROOT, onerror=cls.on_deletion_error)
+
+    def setUp(self):
+        """Clears TEST_ROOT & creates files with different content"""
+        if os.path.isdir(TEST_ROOT):
+            shutil.rmtree(TEST_ROOT, onerror=HashingSchedulerTestCase.on_deletion_error)
+        os.makedirs(f'{DEFAULT_STRUCTURE_ARGUMENT}/first')
+        for index in range(5):
+            with open(f'{DEFAULT_STRUCTURE_ARGUMENT}/first/file{index}.txt', 'w') as file:
+                file.write(f'content {index}')
+        self.database_access = DatabaseManager(DEFAULT_DATABASE_ARGUMENT)
+
+    @staticmethod
+    def on_deletion_error(action, name, exception):
+        """Perform access rights change for a read-only file & delete it"""
+        os.chmod(name, stat.S_IRWXU)
+        os.remove(name)
+
+    def test_buffered_hashing_matches_direct_hashing(self):
+        """Check if buffered hashing produces the same data as hashing in discovery order"""
+        direct = handle_directory_file_system(DEFAULT_STRUCTURE_ARGUMENT, self.database_access)
+        buffered = handle_directory_file_system(DEFAULT_STRUCTURE_ARGUMENT, self.database_access, hashing_window=2)
+        self.assertEqual(direct, buffered)
+        self.assertTrue(all(element.content_hash is not None for element in buffered if isinstance(element, File)))
+
+    def test_files_hashed_in_inode_order(self):
+        """Check if buffered files are hashed in ascending inode order"""
+        with patch('hashing_scheduler.calculate_file_hash', return_value=b'fake hash') as patch_object:
+            handle_directory_file_system(DEFAULT_STRUCTURE_ARGUMENT, self.database_access, hashing_window=10)
+        hashed_inodes = [os.stat(call.args[0]).st_ino for call in patch_object.call_args_list]
+        self.assertEqual(len(hashed_inodes), 5)
+        self.assertEqual(hashed_inodes, sorted(hashed_inodes))
+
+    def test_window_overflow_flushes_buffer(self):
+        """Check if scheduler processes buffered files as soon as window is full"""
+        scheduler = HashingScheduler(2)
+        files = [File(index, f'file{index}.txt', 0.0, '644', None, None) for index in range(3)]
+        paths = [f'{DEFAULT_STRUCTURE_ARGUMENT}/first/file{index}.txt' for index in range(3)]
+        for path, file in zip(paths, files):
+            scheduler.schedule(path, file)
+        self.assertIsNotNone(files[0].content_hash)
+        self.assertIsNotNone(files[1].content_hash)
+        self.assertIsNone(files[2].content_hash)
+        scheduler.flush()
+        self.assertEqual(files[2].content_hash, calculate_file_hash(paths[2], 'sha256'))
+
+
+class HashAlgorithmTestCase(unittest.TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        """Remove all file structures generated while testing"""
+        if os.path.isdir(TEST_ROOT):
+            shutil.rmtree(TEST_ROOT, onerror=cls.on_deletion_error)
+
+    def setUp(self):
+        """Clears TEST_ROOT & creates DatabaseManager"""
+        if os.path.isdir(TEST_ROOT):
+            shutil.rmtree(TEST_ROOT, onerror=HashAlgorithmTestCase.on_deletion_error)
+        os.makedirs(DEFAULT_STRUCTURE_ARGUMENT)
+        self.test_file = f'{DEFAULT_STRUCTURE_ARGUMENT}/file.txt'
+        with open(self.test_file, 'wb') as file:
+            file.write(b'test file content')
+        self.database_access = DatabaseManager(DEFAULT_DATABASE_ARGUMENT)
+
+    @staticmethod
+    def on_deletion_error(action, name, exception):
+        """Perform access rights change for a read-only file & delete it"""
+        os.chmod(name, stat.S_IRWXU)
+        os.remove(name)
+
+    def test_standard_library_algorithms(self):
+        """Check if hashlib-based algorithms are available & calculate correct hashes"""
+        available = get_available_hash_algorithms()
+        for algorithm in ('sha256', 'sha1', 'blake2b', 'blake2s'):
+            self.assertIn(algorithm, available)
+            self.assertEqual(calculate_file_hash(self.test_file, algorithm),
+                             hashlib.new(algorithm, b'test file content').digest())
+
+    def test_unknown_algorithm(self):
+        """Check if correct error is raised for algorithm missing in registry"""
+        self.assertRaises(HashAlgorithmUnavailableError, calculate_file_hash, self.test_file, 'md4_unknown')
+
+    def test_hash_recalculated_on_algorithm_change(self):
+        """Check if stored hash is reused only when it was calculated with the same algorithm"""
+        data = handle_directory_file_system(DEFAULT_STRUCTURE_ARGUMENT, self.database_access)
+        self.database_access.insert_information_into_database(data)
+        with patch('data_collector.calculate_file_hash', return_value=b'fake hash') as patch_object:
+            handle_directory_file_system(DEFAULT_STRUCTURE_ARGUMENT, self.database_access)
+            patch_object.assert_not_called()
+            data = handle_directory_file_system(DEFAULT_STRUCTURE_ARGUMENT, self.database_access,
+                                                hash_algorithm='blake2b')
+            patch_object.assert_called_once_with(os.path.abspath(self.test_file), 'blake2b')
+        self.assertEqual(data[-1].hash_algorithm, 'blake2b')
+
+    def test_old_database_migration(self):
+        """Check if database without hash algorithm column is upgraded & its hashes are treated as SHA256"""
+        connection = sqlite3.connect(DEFAULT_DATABASE_ARGUMENT)
+        connection.execute('CREATE TABLE files (id integer PRIMARY KEY, directory integer NOT NULL, '
+                           'name text NOT NULL, last_modification timestamp NOT NULL, access_rights text NOT NULL, '
+                           'content_hash BLOB(32) NOT NULL)')
+        connection.execute("INSERT INTO files VALUES(1, 1, 'file.txt', 0.0, '644', x'00')")
+        connection.commit()
+        connection.close()
+        self.assertEqual(self.database_access.get_file_information_from_database(1), (0.0, b'\x00', 'sha256'))
+
+
 class UtilityTestCase(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
@@ -266,14 +430,135 @@ class UtilityTestCase(unittest.TestCase):
         test_file = f'{TEST_ROOT}/test_file.txt'
         file_content = 'test file content repeat: test file content'.encode('utf-8')
         UtilityTestCase.create_and_fill_file(test_file, file_content)
-        self.assertEqual(calculate_file_sha256_hash(test_file), hashlib.sha256(file_content).digest())
+        self.assertEqual(calculate_file_hash(test_file, 'sha256'), hashlib.sha256(file_content).digest())
 
     def test_huge_file_hash_calculation(self):
         """Calculate hash for a file with not-single-chunked content"""
         test_file = f'{TEST_ROOT}/test_file.txt'
+        file_content = os.urandom(CHUNK_SIZE * 2 + 100)
+        UtilityTestCase.create_and_fill_file(test_file, file_content)
+        self.assertEqual(calculate_file_hash(test_file, 'sha256'), hashlib.sha256(file_content).digest())
+
+    def test_hash_calculation_with_io_hints(self):
+        """Check if access pattern hints do not affect calculated hash"""
+        test_file = f'{TEST_ROOT}/test_file.txt'
         file_content = UtilityTestCase.generate_random_string(10000).encode('utf-8')
         UtilityTestCase.create_and_fill_file(test_file, file_content)
-        self.assertEqual(calculate_file_sha256_hash(test_file), hashlib.sha256(file_content).digest())
+        prefetch_file(test_file)
+        self.assertEqual(calculate_file_hash(test_file, 'sha256', io_hints=True), hashlib.sha256(file_content).digest())
+
+    def test_advised_ranges(self):
+        """Check if prefetch covers only file beginning & reading hints cover the whole file"""
+        test_file = f'{TEST_ROOT}/test_file.txt'
+        UtilityTestCase.create_and_fill_file(test_file, b'test file content')
+        with patch('utility.os.posix_fadvise') as patch_object:
+            prefetch_file(test_file)
+            calculate_file_hash(test_file, 'sha256', io_hints=True)
+        advised = [(call.args[1], call.args[2], call.args[3]) for call in patch_object.call_args_list]
+        self.assertEqual(advised, [(0, PREFETCH_WINDOW_SIZE, os.POSIX_FADV_WILLNEED),
+                                   (0, 0, os.POSIX_FADV_SEQUENTIAL), (0, 0, os.POSIX_FADV_DONTNEED)])
+
+    def test_prefetch_skipped_with_read_budget(self):
+        """Check if readahead is not issued when it would bypass reading budget"""
+        test_file = f'{TEST_ROOT}/test_file.txt'
+        UtilityTestCase.create_and_fill_file(test_file, b'test file content')
+        throttling.limiter = ResourceLimiter(bytes_per_second=1024)
+        try:
+            with patch('utility.os.posix_fadvise') as patch_object:
+                prefetch_file(test_file)
+            patch_object.assert_not_called()
+        finally:
+            throttling.limiter = ResourceLimiter()
+
+
+class ThrottlingTestCase(unittest.TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        """Remove all file structures generated while testing"""
+        if os.path.isdir(TEST_ROOT):
+            shutil.rmtree(TEST_ROOT, onerror=cls.on_deletion_error)
+
+    def setUp(self):
+        """Clears TEST_ROOT; patches sleeping so throttling does not slow tests down"""
+        if os.path.isdir(TEST_ROOT):
+            shutil.rmtree(TEST_ROOT, onerror=ThrottlingTestCase.on_deletion_error)
+        os.makedirs(TEST_ROOT)
+        self.patcher = patch('throttling.time.sleep')
+        self.patch_object = self.patcher.start()
+
+    def tearDown(self):
+        """Stops patcher for sleeping & restores unlimited limiter"""
+        self.patcher.stop()
+        throttling.limiter = ResourceLimiter()
+
+    @staticmethod
+    def on_deletion_error(action, name, exception):
+        """Perform access rights change for a read-only file & delete it"""
+        os.chmod(name, stat.S_IRWXU)
+        os.remove(name)
+
+    def test_token_bucket_allows_burst(self):
+        """Check if bucket does not sleep while consumption fits into its capacity"""
+        bucket = TokenBucket(100)
+        self.assertEqual(bucket.consume(60), 0.0)
+        self.assertEqual(bucket.consume(40), 0.0)
+        self.patch_object.assert_not_called()
+
+    def test_token_bucket_sleeps_on_exhaustion(self):
+        """Check if bucket sleeps proportionally to the missing tokens"""
+        bucket = TokenBucket(100)
+        delay = bucket.consume(150)
+        self.assertAlmostEqual(delay, 0.5, places=2)
+        self.patch_object.assert_called_once()
+
+    def test_hash_calculation_is_throttled(self):
+        """Check if reading file content is accounted by read budget"""
+        test_file = f'{TEST_ROOT}/test_file.txt'
+        with open(test_file, 'wb') as file:
+            file.write(b'a' * CHUNK_SIZE * 4)
+        throttling.limiter = ResourceLimiter(bytes_per_second=CHUNK_SIZE)
+        calculate_file_hash(test_file, 'sha256')
+        self.assertAlmostEqual(throttling.limiter.read_delay, 3, places=1)
+
+    def test_directory_descriptor_scan_is_throttled(self):
+        """Check if stat budget is charged once per element during descriptor-based traversal"""
+        for index in range(4):
+            with open(f'{TEST_ROOT}/file{index}.txt', 'x'):
+                pass
+        throttling.limiter = ResourceLimiter(stats_per_second=1)
+        with patch('path_interning.os.stat', wraps=os.stat) as stat_patch:
+            scan_directory_with_descriptor(TEST_ROOT)
+            self.assertEqual(stat_patch.call_count, 4)
+        self.assertAlmostEqual(throttling.limiter.stat_delay, 3, places=1)  # first stat fits into burst
+        database_access = DatabaseManager(':memory:')
+        handle_directory_file_system(TEST_ROOT, database_access, use_directory_descriptors=True)
+        self.assertAlmostEqual(throttling.limiter.stat_delay, 3 + 5, places=1)  # root & 4 files
+
+
+class StartupTestCase(unittest.TestCase):
+    def test_import_has_no_file_system_side_effects(self):
+        """Check if importing entry point neither creates base log nor imports heavy modules"""
+        package_directory = os.path.dirname(os.path.abspath(__file__))
+        check = ('import sys, directory_profiler; '
+                 'print(sorted({"sqlite3", "hashlib", "logging"} & set(sys.modules)))')
+        with tempfile.TemporaryDirectory() as working_directory:
+            result = subprocess.run([sys.executable, '-c', check], cwd=working_directory, capture_output=True,
+                                    text=True, check=True, env={**os.environ, 'PYTHONPATH': package_directory})
+            self.assertFalse(os.listdir(working_directory))
+        self.assertEqual(result.stdout.strip(), '[]')
+
+    def test_import_time_measurement(self):
+        """Check if import time benchmark finds entry point in '-X importtime' output"""
+        self.assertGreater(measure_import_time(), 0)
+
+    def test_schema_bootstrapped_once(self):
+        """Check if tables are created only on the first write"""
+        database_access = DatabaseManager(':memory:')
+        with patch.object(database_access, 'cursor', wraps=database_access.cursor) as cursor:
+            database_access.insert_information_into_database([])
+            database_access.insert_information_into_database([])
+        creations = [call for call in cursor.execute.call_args_list if 'CREATE TABLE' in call.args[0]]
+        self.assertEqual(len(creations), 2)  # directories & files tables
 
 
 class DatabaseManagerTestCase(unittest.TestCase):
@@ -338,6 +623,40 @@ class DatabaseManagerTestCase(unittest.TestCase):
         self.assertTrue(all(directory_names[file_parents[element.name]] == element.directory.name for element in
                             self.data if isinstance(element, File)))
 
+    def test_directory_paths_reconstruction(self):
+        """Check if directory paths are rebuilt from parent chain stored in database"""
+        self.database_access.insert_information_into_database(self.data)
+        paths = self.database_access.get_directory_paths()
+        root = os.path.basename(DEFAULT_STRUCTURE_ARGUMENT)
+        self.assertEqual(paths[self.data[0].id], root)
+        fifth = next(element for element in self.data if isinstance(element, Directory) and element.name == 'fifth')
+        self.assertEqual(paths[fifth.id], os.path.join(root, 'fourth', 'fifth'))
+
+    def test_directory_paths_from_root_path(self):
+        """Check if directory paths rebuilt from given root path lead to existing directories"""
+        self.database_access.insert_information_into_database(self.data)
+        paths = self.database_access.get_directory_paths(DEFAULT_STRUCTURE_ARGUMENT)
+        self.assertEqual(paths[self.data[0].id], os.path.abspath(DEFAULT_STRUCTURE_ARGUMENT))
+        directories = [element for element in self.data if isinstance(element, Directory)]
+        self.assertEqual(len(paths), len(directories))
+        self.assertTrue(all(os.path.isdir(paths[directory.id]) for directory in directories))
+        self.assertEqual(self.database_access.get_directory_paths(f'{TEST_ROOT}/missing'), {})
+
+    def test_directory_paths_for_roots_with_same_name(self):
+        """Check if only the tree of the given root is returned when another root has the same name"""
+        first_root = f'{TEST_ROOT}/first_root/data'
+        second_root = f'{TEST_ROOT}/second_root/data'
+        os.makedirs(f'{first_root}/own')
+        os.makedirs(f'{second_root}/other')
+        database_access = DatabaseManager(f'{TEST_ROOT}/roots.db')
+        database_access.insert_information_into_database(handle_directory_file_system(first_root, database_access))
+        database_access.insert_information_into_database(handle_directory_file_system(second_root, database_access))
+        paths = database_access.get_directory_paths(first_root)
+        self.assertEqual(sorted(paths.values()), [os.path.abspath(first_root),
+                                                  os.path.join(os.path.abspath(first_root), 'own')])
+        shutil.rmtree(f'{TEST_ROOT}/first_root')
+        shutil.rmtree(f'{TEST_ROOT}/second_root')
+
 
 if __name__ == '__main__':
     unittest.main()
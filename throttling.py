@@ -0,0 +1,93 @@
+# Max Markov 10.19.2026
+
+import os
+import time
+from typing import List, Optional
+
+
+THROTTLING_SUMMARY_MESSAGE_TEMPLATE = 'Throttling delayed run by {:.3f}s (reading: {:.3f}s, stat calls: {:.3f}s)'
+PRIORITY_MESSAGE_TEMPLATE = 'Process niceness set to {}'
+IDLE_IO_MESSAGE = 'Process I/O scheduling class set to idle'
+IDLE_IO_UNAVAILABLE_MESSAGE = 'Idle I/O scheduling class is not available on this platform'
+
+
+class TokenBucket:
+    """Rate limiter allowing short bursts up to one second worth of tokens"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.last_refill = time.monotonic()
+
+    def consume(self, amount: float) -> float:
+        """Take tokens from bucket, sleeping until they are available
+        NOTE: Amount bigger than bucket capacity is allowed & paid off by a longer sleep
+        :param amount: Amount of tokens to take
+        :return: Time spent sleeping in seconds
+        """
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+        self.tokens -= amount
+        if self.tokens >= 0:
+            return 0.0
+        delay = -self.tokens / self.rate
+        time.sleep(delay)
+        self.tokens = 0
+        self.last_refill = time.monotonic()
+        return delay
+
+
+class ResourceLimiter:
+    """Keeps file system access of the run within configured budgets
+    NOTE: Every budget left as None is not limited
+    """
+
+    def __init__(self, bytes_per_second: Optional[int] = None, stats_per_second: Optional[int] = None):
+        self.read_bucket = TokenBucket(bytes_per_second) if bytes_per_second is not None else None
+        self.stat_bucket = TokenBucket(stats_per_second) if stats_per_second is not None else None
+        self.read_delay = 0.0
+        self.stat_delay = 0.0
+
+    def consume_read(self, amount: int):
+        """Account bytes read from file content
+        :param amount: Amount of bytes read
+        """
+        if self.read_bucket is not None:
+            self.read_delay += self.read_bucket.consume(amount)
+
+    def is_reading_limited(self) -> bool:
+        """Check if reading budget is set"""
+        return self.read_bucket is not None
+
+    def consume_stat(self):
+        """Account single stat call"""
+        if self.stat_bucket is not None:
+            self.stat_delay += self.stat_bucket.consume(1)
+
+    def get_summary(self) -> str:
+        """Describe how much the run was slowed down by throttling"""
+        return THROTTLING_SUMMARY_MESSAGE_TEMPLATE.format(self.read_delay + self.stat_delay, self.read_delay,
+                                                          self.stat_delay)
+
+
+def lower_process_priority(niceness: int, idle_io: bool) -> List[str]:
+    """Make process yield CPU & disk to other workloads on the host
+    :param niceness: Increment for process niceness, 0 keeps it untouched
+    :param idle_io: Switch process to idle I/O scheduling class (needs optional psutil package)
+    :return: Messages describing applied changes
+    """
+    messages = []
+    if niceness > 0 and hasattr(os, 'nice'):
+        messages.append(PRIORITY_MESSAGE_TEMPLATE.format(os.nice(niceness)))
+    if idle_io:
+        try:
+            import psutil
+            psutil.Process().ionice(psutil.IOPRIO_CLASS_IDLE)
+            messages.append(IDLE_IO_MESSAGE)
+        except (ImportError, AttributeError, OSError):
+            messages.append(IDLE_IO_UNAVAILABLE_MESSAGE)
+    return messages
+
+
+limiter = ResourceLimiter()
@@ -1,12 +1,20 @@
 # Max Markov 01.25.2023
 
 import os
-import hashlib
 from typing import Optional
 
+import throttling
+from hash_algorithms import DEFAULT_HASH_ALGORITHM, get_hash_constructor
+
 
 OCTAL_XYZ_RIGHTS_SLICE_START = -3
-CHUNK_SIZE = 4096
+CHUNK_SIZE = 1024 * 1024  # NOTE: big chunks keep per-chunk Python overhead small compared to hashing itself
+PREFETCH_WINDOW_SIZE = 4 * 1024 * 1024  # NOTE: only file beginning is prefetched, so big files do not flood page cache
+
+# NOTE: posix_fadvise is missing on some platforms (e.g. Windows) - hints are silently skipped there
+ADVICE_SEQUENTIAL = getattr(os, 'POSIX_FADV_SEQUENTIAL', None)
+ADVICE_WILL_NEED = getattr(os, 'POSIX_FADV_WILLNEED', None)
+ADVICE_DONT_NEED = getattr(os, 'POSIX_FADV_DONTNEED', None)
 
 
 class FileCanNotBeAccessedError(Exception):
@@ -56,16 +64,60 @@ def get_file_access_rights(file_mode: int) -> str:
     return oct(file_mode)[OCTAL_XYZ_RIGHTS_SLICE_START:]
 
 
-def calculate_file_sha256_hash(file_path: str) -> Optional[bytes]:
-    """Compute SHA256 hash of specified file content
+def advise_file_access(descriptor: int, advice: Optional[int], length: int = 0):
+    """Give kernel a hint about upcoming access pattern for the file beginning
+    :param descriptor: Descriptor of the opened file
+    :param advice: One of POSIX_FADV_* constants, None if platform does not support it
+    :param length: Amount of bytes from file beginning the hint covers, 0 stands for the whole file
+    """
+    if advice is None:
+        return
+    try:
+        os.posix_fadvise(descriptor, 0, length, advice)
+    except OSError:
+        pass
+
+
+def prefetch_file(file_path: str):
+    """Ask kernel to start reading file beginning into page cache ahead of actual reading
+    NOTE: Prefetch is skipped if reading is throttled, as readahead bypasses read budget
+    :param file_path: Path to file which is going to be read soon
+    """
+    if ADVICE_WILL_NEED is None or throttling.limiter.is_reading_limited():
+        return
+    try:
+        descriptor = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        advise_file_access(descriptor, ADVICE_WILL_NEED, PREFETCH_WINDOW_SIZE)
+    finally:
+        os.close(descriptor)
+
+
+def calculate_file_hash(file_path: str, algorithm: str = DEFAULT_HASH_ALGORITHM,
+                        io_hints: bool = False) -> Optional[bytes]:
+    """Compute hash of specified file content with selected algorithm
+    NOTE: Reading is throttled according to throttling.limiter budgets; content is read into single reused buffer
     :param file_path: Path to file for hash calculation
-    :return: SHA256 hash of file content as bytes
+    :param algorithm: Name of the algorithm from hash_algorithms.HASH_ALGORITHM_LOADERS
+    :param io_hints: Advise sequential reading & drop file content from page cache afterwards
+    :return: Hash of file content as bytes
+    :raise: HashAlgorithmUnavailableError
     """
+    hash_constructor = get_hash_constructor(algorithm)
     try:
-        with open(file_path, 'rb') as file:
-            file_hash = hashlib.sha256()
-            while part := file.read(CHUNK_SIZE):
-                file_hash.update(part)
+        with open(file_path, 'rb', buffering=0) as file:
+            if io_hints:
+                advise_file_access(file.fileno(), ADVICE_SEQUENTIAL)
+            file_hash = hash_constructor()
+            chunk = bytearray(CHUNK_SIZE)
+            chunk_view = memoryview(chunk)
+            while size := file.readinto(chunk):
+                throttling.limiter.consume_read(size)
+                file_hash.update(chunk_view[:size])
+            if io_hints:
+                advise_file_access(file.fileno(), ADVICE_DONT_NEED)
             return file_hash.digest()
     except PermissionError:
         return None